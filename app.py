@@ -1,8 +1,9 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from data import get_bess_data
+from data import get_bess_data, TECHNOLOGIES, CATEGORIES, YEARS
 
 # Page Configuration
 st.set_page_config(
@@ -23,252 +24,310 @@ It explores the current landscape and projects future trends over 3, 5, and 10-y
 def load_data():
     return get_bess_data()
 
-try:
+@st.cache_data
+def apply_filters(technologies, categories, years):
+    """
+    Filters the dataset, slices out the 2025 and 2035 snapshots and
+    precomputes the snapshot KPIs and the CSV export.
+    Arguments are sorted tuples so identical selections share a cache entry.
+    """
     df = load_data()
-
-    # Sidebar Filters
-    st.sidebar.header("Filters")
-
-    # Technology filter
-    all_technologies = df['Technology'].unique().tolist()
-    selected_technologies = st.sidebar.multiselect(
-        "Select Technologies",
-        options=all_technologies,
-        default=all_technologies
-    )
-
-    # Category filter
-    all_categories = df['Category'].unique().tolist()
-    selected_categories = st.sidebar.multiselect(
-        "Select Categories",
-        options=all_categories,
-        default=all_categories
+    # Combine the predicates as plain boolean arrays, one mask and one take
+    mask = (
+        df['Technology'].isin(technologies).to_numpy() &
+        df['Category'].isin(categories).to_numpy() &
+        df['Year'].isin(years).to_numpy()
     )
+    filtered_df = df[mask]
+
+    # Split by year once, absent years fall back to an empty frame
+    by_year = {year: g for year, g in filtered_df.groupby('Year')}
+    current_df = by_year.get(2025, filtered_df.iloc[:0])
+    future_df = by_year.get(2035, filtered_df.iloc[:0])
+
+    # Snapshot KPIs, one row per metric leader
+    kpis = {}
+    if not current_df.empty:
+        kpis = {
+            'lowest_capex': current_df.loc[current_df['CAPEX ($/kWh)'].idxmin()].to_dict(),
+            'highest_eff': current_df.loc[current_df['Efficiency (%)'].idxmax()].to_dict(),
+            'longest_cycle': current_df.loc[current_df['Cycle Life'].idxmax()].to_dict(),
+            'lowest_lcos': current_df.loc[current_df['LCOS ($/MWh)'].idxmin()].to_dict()
+        }
+    return filtered_df, current_df, future_df, kpis, to_csv_bytes(filtered_df)
+
+RADAR_METRICS = ['CAPEX ($/kWh)', 'Efficiency (%)', 'Cycle Life', 'Energy Density (Wh/L)', 'LCOS ($/MWh)']
 
-    # Timeframe filter
-    all_years = sorted(df['Year'].unique().tolist())
-    selected_years = st.sidebar.multiselect(
-        "Select Years",
-        options=all_years,
-        default=all_years
+@st.cache_data
+def radar_ranges():
+    """
+    Returns the min and max of each radar metric over all 2025 data, so the
+    radar scale does not shift when technologies are filtered out.
+    """
+    df = load_data()
+    metrics = df.loc[df['Year'] == 2025, RADAR_METRICS].to_numpy(dtype=np.float64)
+    return metrics.min(axis=0), metrics.max(axis=0)
+
+def to_csv_bytes(data):
+    """
+    Returns the frame as UTF-8 encoded CSV for the download button.
+    """
+    return data.to_csv(index=False).encode('utf-8')
+
+def line_chart(key, data, y, title):
+    """
+    Returns a per-technology line chart kept in session state under `key`.
+    When the plotted technologies are unchanged, only the trace data is
+    replaced instead of rebuilding the figure.
+    """
+    groups = {tech: g for tech, g in data.groupby('Technology', observed=True)}
+    fig = st.session_state.get(key)
+
+    if fig is not None and [trace.name for trace in fig.data] == list(groups):
+        for tech, g in groups.items():
+            fig.update_traces(selector=dict(name=tech), x=g['Year'], y=g[y])
+        return fig
+
+    fig = go.Figure([
+        go.Scattergl(x=g['Year'], y=g[y], mode='lines+markers', name=tech)
+        for tech, g in groups.items()
+    ])
+    fig.update_layout(
+        title=title,
+        xaxis_title="Year",
+        yaxis_title=y,
+        legend_title="Technology",
+        hovermode="x unified"
     )
+    st.session_state[key] = fig
+    return fig
+
+def render_charts(technologies, categories, years):
+    """
+    Renders the KPI row, charts and raw data for the selected filters.
+    """
+    try:
+        # Apply filters
+        filtered_df, current_df, future_df, kpis, csv = apply_filters(
+            tuple(sorted(technologies)),
+            tuple(sorted(categories)),
+            tuple(sorted(years))
+        )
 
-    # Apply filters
-    filtered_df = df[
-        (df['Technology'].isin(selected_technologies)) &
-        (df['Category'].isin(selected_categories)) &
-        (df['Year'].isin(selected_years))
-    ]
-
-    if filtered_df.empty:
-        st.warning("No data matches your filter selection. Please adjust filters.")
-    else:
-        # Key Metrics Summary (Current Year)
-        st.header("📊 Current Technology Snapshot (2025)")
-        current_df = filtered_df[filtered_df['Year'] == 2025]
-
-        if not current_df.empty:
-            col1, col2, col3, col4 = st.columns(4)
-
-            with col1:
-                lowest_capex = current_df.loc[current_df['CAPEX ($/kWh)'].idxmin()]
-                st.metric(
-                    label="Lowest CAPEX",
-                    value=f"${lowest_capex['CAPEX ($/kWh)']:.0f}/kWh",
-                    delta=lowest_capex['Technology']
+        if filtered_df.empty:
+            st.warning("No data matches your filter selection. Please adjust filters.")
+        else:
+            # Key Metrics Summary (Current Year)
+            st.header("📊 Current Technology Snapshot (2025)")
+
+            if not current_df.empty:
+                col1, col2, col3, col4 = st.columns(4)
+
+                with col1:
+                    lowest_capex = kpis['lowest_capex']
+                    st.metric(
+                        label="Lowest CAPEX",
+                        value=f"${lowest_capex['CAPEX ($/kWh)']:.0f}/kWh",
+                        delta=lowest_capex['Technology']
+                    )
+
+                with col2:
+                    highest_eff = kpis['highest_eff']
+                    st.metric(
+                        label="Highest Efficiency",
+                        value=f"{highest_eff['Efficiency (%)']:.1f}%",
+                        delta=highest_eff['Technology']
+                    )
+
+                with col3:
+                    longest_cycle = kpis['longest_cycle']
+                    st.metric(
+                        label="Longest Cycle Life",
+                        value=f"{longest_cycle['Cycle Life']:,}",
+                        delta=longest_cycle['Technology']
+                    )
+
+                with col4:
+                    lowest_lcos = kpis['lowest_lcos']
+                    st.metric(
+                        label="Lowest LCOS",
+                        value=f"${lowest_lcos['LCOS ($/MWh)']:.0f}/MWh",
+                        delta=lowest_lcos['Technology']
+                    )
+
+            st.divider()
+
+            # CAPEX Comparison Chart
+            st.header("💰 CAPEX Trends Over Time")
+
+            fig_capex = line_chart('fig_capex', filtered_df, 'CAPEX ($/kWh)', "CAPEX Projection by Technology ($/kWh)")
+            st.plotly_chart(fig_capex, use_container_width=True)
+
+            # Two column layout for Efficiency and Cycle Life
+            col_left, col_right = st.columns(2)
+
+            with col_left:
+                st.header("⚡ Efficiency Comparison")
+                fig_eff = px.bar(
+                    filtered_df,
+                    x='Technology',
+                    y='Efficiency (%)',
+                    color='Year',
+                    barmode='group',
+                    title="Round-Trip Efficiency by Technology (%)"
                 )
-
-            with col2:
-                highest_eff = current_df.loc[current_df['Efficiency (%)'].idxmax()]
-                st.metric(
-                    label="Highest Efficiency",
-                    value=f"{highest_eff['Efficiency (%)']:.1f}%",
-                    delta=highest_eff['Technology']
+                fig_eff.update_layout(
+                    xaxis_title="Technology",
+                    yaxis_title="Efficiency (%)",
+                    xaxis_tickangle=-45
                 )
-
-            with col3:
-                longest_cycle = current_df.loc[current_df['Cycle Life'].idxmax()]
-                st.metric(
-                    label="Longest Cycle Life",
-                    value=f"{longest_cycle['Cycle Life']:,}",
-                    delta=longest_cycle['Technology']
+                st.plotly_chart(fig_eff, use_container_width=True)
+
+            with col_right:
+                st.header("🔄 Cycle Life Comparison")
+                fig_cycles = px.bar(
+                    filtered_df,
+                    x='Technology',
+                    y='Cycle Life',
+                    color='Year',
+                    barmode='group',
+                    title="Cycle Life by Technology"
+                )
+                fig_cycles.update_layout(
+                    xaxis_title="Technology",
+                    yaxis_title="Cycle Life (cycles)",
+                    xaxis_tickangle=-45
                 )
+                st.plotly_chart(fig_cycles, use_container_width=True)
+
+            st.divider()
+
+            # LCOS Analysis
+            st.header("📈 Levelized Cost of Storage (LCOS)")
+
+            fig_lcos = line_chart('fig_lcos', filtered_df, 'LCOS ($/MWh)', "LCOS Projection by Technology ($/MWh)")
+            st.plotly_chart(fig_lcos, use_container_width=True)
+
+            # Energy Density Comparison
+            st.header("🔋 Energy Density Comparison")
+
+            if not current_df.empty:
+                fig_density = go.Figure()
+
+                fig_density.add_trace(go.Bar(
+                    name='2025',
+                    x=current_df['Technology'],
+                    y=current_df['Energy Density (Wh/L)'],
+                    marker_color='steelblue'
+                ))
 
-            with col4:
-                lowest_lcos = current_df.loc[current_df['LCOS ($/MWh)'].idxmin()]
-                st.metric(
-                    label="Lowest LCOS",
-                    value=f"${lowest_lcos['LCOS ($/MWh)']:.0f}/MWh",
-                    delta=lowest_lcos['Technology']
+                if not future_df.empty:
+                    fig_density.add_trace(go.Bar(
+                        name='2035',
+                        x=future_df['Technology'],
+                        y=future_df['Energy Density (Wh/L)'],
+                        marker_color='coral'
+                    ))
+
+                fig_density.update_layout(
+                    title="Energy Density Comparison: Current vs 10-Year Projection",
+                    xaxis_title="Technology",
+                    yaxis_title="Energy Density (Wh/L)",
+                    barmode='group',
+                    xaxis_tickangle=-45
                 )
+                st.plotly_chart(fig_density, use_container_width=True)
 
-        st.divider()
+            st.divider()
 
-        # CAPEX Comparison Chart
-        st.header("💰 CAPEX Trends Over Time")
+            # Technology Radar/Spider Chart for Current Year
+            st.header("🎯 Technology Profile Comparison (2025)")
 
-        fig_capex = px.line(
-            filtered_df,
-            x='Year',
-            y='CAPEX ($/kWh)',
-            color='Technology',
-            markers=True,
-            title="CAPEX Projection by Technology ($/kWh)"
-        )
-        fig_capex.update_layout(
-            xaxis_title="Year",
-            yaxis_title="CAPEX ($/kWh)",
-            legend_title="Technology",
-            hovermode="x unified"
-        )
-        st.plotly_chart(fig_capex, use_container_width=True)
-
-        # Two column layout for Efficiency and Cycle Life
-        col_left, col_right = st.columns(2)
-
-        with col_left:
-            st.header("⚡ Efficiency Comparison")
-            fig_eff = px.bar(
-                filtered_df,
-                x='Technology',
-                y='Efficiency (%)',
-                color='Year',
-                barmode='group',
-                title="Round-Trip Efficiency by Technology (%)"
-            )
-            fig_eff.update_layout(
-                xaxis_title="Technology",
-                yaxis_title="Efficiency (%)",
-                xaxis_tickangle=-45
-            )
-            st.plotly_chart(fig_eff, use_container_width=True)
-
-        with col_right:
-            st.header("🔄 Cycle Life Comparison")
-            fig_cycles = px.bar(
-                filtered_df,
-                x='Technology',
-                y='Cycle Life',
-                color='Year',
-                barmode='group',
-                title="Cycle Life by Technology"
-            )
-            fig_cycles.update_layout(
-                xaxis_title="Technology",
-                yaxis_title="Cycle Life (cycles)",
-                xaxis_tickangle=-45
-            )
-            st.plotly_chart(fig_cycles, use_container_width=True)
-
-        st.divider()
-
-        # LCOS Analysis
-        st.header("📈 Levelized Cost of Storage (LCOS)")
-
-        fig_lcos = px.line(
-            filtered_df,
-            x='Year',
-            y='LCOS ($/MWh)',
-            color='Technology',
-            markers=True,
-            title="LCOS Projection by Technology ($/MWh)"
-        )
-        fig_lcos.update_layout(
-            xaxis_title="Year",
-            yaxis_title="LCOS ($/MWh)",
-            legend_title="Technology",
-            hovermode="x unified"
-        )
-        st.plotly_chart(fig_lcos, use_container_width=True)
+            if not current_df.empty:
+                # Normalize metrics for radar chart
+                radar_df = current_df.copy()
 
-        # Energy Density Comparison
-        st.header("🔋 Energy Density Comparison")
+                score_cols = ['CAPEX Score', 'Efficiency Score', 'Cycle Score', 'Density Score', 'LCOS Score']
 
-        current_year_data = filtered_df[filtered_df['Year'] == 2025]
-        future_year_data = filtered_df[filtered_df['Year'] == 2035]
+                # Min-max scale all metrics against the fixed full-data ranges
+                metrics = radar_df[RADAR_METRICS].to_numpy(dtype=np.float64)
+                mn, mx = radar_ranges()
+                norm = (metrics - mn) / (mx - mn + 0.01)
 
-        if not current_year_data.empty:
-            fig_density = go.Figure()
+                # Invert CAPEX and LCOS (lower is better)
+                norm[:, [0, 4]] = 1 - norm[:, [0, 4]]
+                radar_df[score_cols] = norm
 
-            fig_density.add_trace(go.Bar(
-                name='2025',
-                x=current_year_data['Technology'],
-                y=current_year_data['Energy Density (Wh/L)'],
-                marker_color='steelblue'
-            ))
+                names = radar_df['Technology'].to_numpy()
+                scores = radar_df[score_cols].to_numpy()
+                theta = ['Cost', 'Efficiency', 'Cycle Life', 'Energy Density', 'LCOS']
 
-            if not future_year_data.empty:
-                fig_density.add_trace(go.Bar(
-                    name='2035',
-                    x=future_year_data['Technology'],
-                    y=future_year_data['Energy Density (Wh/L)'],
-                    marker_color='coral'
-                ))
+                fig_radar = go.Figure(data=[
+                    go.Scatterpolar(r=scores[i], theta=theta, fill='toself', name=names[i])
+                    for i in range(len(names))
+                ])
 
-            fig_density.update_layout(
-                title="Energy Density Comparison: Current vs 10-Year Projection",
-                xaxis_title="Technology",
-                yaxis_title="Energy Density (Wh/L)",
-                barmode='group',
-                xaxis_tickangle=-45
-            )
-            st.plotly_chart(fig_density, use_container_width=True)
-
-        st.divider()
-
-        # Technology Radar/Spider Chart for Current Year
-        st.header("🎯 Technology Profile Comparison (2025)")
-
-        if not current_df.empty:
-            # Normalize metrics for radar chart
-            radar_df = current_df.copy()
-
-            # Invert CAPEX and LCOS (lower is better)
-            radar_df['CAPEX Score'] = 1 - (radar_df['CAPEX ($/kWh)'] - radar_df['CAPEX ($/kWh)'].min()) / (radar_df['CAPEX ($/kWh)'].max() - radar_df['CAPEX ($/kWh)'].min() + 0.01)
-            radar_df['LCOS Score'] = 1 - (radar_df['LCOS ($/MWh)'] - radar_df['LCOS ($/MWh)'].min()) / (radar_df['LCOS ($/MWh)'].max() - radar_df['LCOS ($/MWh)'].min() + 0.01)
-            radar_df['Efficiency Score'] = (radar_df['Efficiency (%)'] - radar_df['Efficiency (%)'].min()) / (radar_df['Efficiency (%)'].max() - radar_df['Efficiency (%)'].min() + 0.01)
-            radar_df['Cycle Score'] = (radar_df['Cycle Life'] - radar_df['Cycle Life'].min()) / (radar_df['Cycle Life'].max() - radar_df['Cycle Life'].min() + 0.01)
-            radar_df['Density Score'] = (radar_df['Energy Density (Wh/L)'] - radar_df['Energy Density (Wh/L)'].min()) / (radar_df['Energy Density (Wh/L)'].max() - radar_df['Energy Density (Wh/L)'].min() + 0.01)
-
-            categories = ['CAPEX Score', 'Efficiency Score', 'Cycle Score', 'Density Score', 'LCOS Score']
-
-            fig_radar = go.Figure()
-
-            for _, row in radar_df.iterrows():
-                fig_radar.add_trace(go.Scatterpolar(
-                    r=[row['CAPEX Score'], row['Efficiency Score'], row['Cycle Score'], row['Density Score'], row['LCOS Score']],
-                    theta=['Cost', 'Efficiency', 'Cycle Life', 'Energy Density', 'LCOS'],
-                    fill='toself',
-                    name=row['Technology']
-                ))
+                fig_radar.update_layout(
+                    polar=dict(
+                        radialaxis=dict(visible=True, range=[0, 1])
+                    ),
+                    showlegend=True,
+                    title="Normalized Technology Comparison (Higher = Better)"
+                )
+                st.plotly_chart(fig_radar, use_container_width=True)
+
+            # Raw Data Preview
+            with st.expander("📋 View Raw Data"):
+                # Only ship a bounded window of rows to the browser
+                max_rows = 500
+                if len(filtered_df) > max_rows:
+                    start = st.slider("Start row", 0, len(filtered_df) - max_rows)
+                    st.dataframe(filtered_df.iloc[start:start + max_rows], use_container_width=True)
+                else:
+                    st.dataframe(filtered_df, use_container_width=True)
+
+                # Download button
+                st.download_button(
+                    label="Download as CSV",
+                    data=csv,
+                    file_name="bess_technology_data.csv",
+                    mime="text/csv"
+                )
+
+    except Exception as e:
+        st.error(f"Error loading data: {e}")
+        st.exception(e)
+
+# Sidebar Filters
+st.sidebar.header("Filters")
+
+# Technology filter
+all_technologies = list(TECHNOLOGIES)
+selected_technologies = st.sidebar.multiselect(
+    "Select Technologies",
+    options=all_technologies,
+    default=all_technologies
+)
+
+# Category filter
+all_categories = list(CATEGORIES)
+selected_categories = st.sidebar.multiselect(
+    "Select Categories",
+    options=all_categories,
+    default=all_categories
+)
+
+# Timeframe filter
+all_years = list(YEARS)
+selected_years = st.sidebar.multiselect(
+    "Select Years",
+    options=all_years,
+    default=all_years
+)
 
-            fig_radar.update_layout(
-                polar=dict(
-                    radialaxis=dict(visible=True, range=[0, 1])
-                ),
-                showlegend=True,
-                title="Normalized Technology Comparison (Higher = Better)"
-            )
-            st.plotly_chart(fig_radar, use_container_width=True)
-
-        # Raw Data Preview
-        with st.expander("📋 View Raw Data"):
-            st.dataframe(filtered_df, use_container_width=True)
-
-            # Download button
-            csv = filtered_df.to_csv(index=False)
-            st.download_button(
-                label="Download as CSV",
-                data=csv,
-                file_name="bess_technology_data.csv",
-                mime="text/csv"
-            )
-
-except Exception as e:
-    st.error(f"Error loading data: {e}")
-    st.exception(e)
+# Charts and tables for the current selection
+render_charts(selected_technologies, selected_categories, selected_years)
 
 # Footer
 st.sidebar.divider()
-st.sidebar.markdown("---")
 st.sidebar.caption("Data based on industry trends (NREL, BNEF) - For demonstration purposes")
@@ -1,6 +1,28 @@
 import pandas as pd
 import numpy as np
 
+# Filter domains, in display order
+TECHNOLOGIES = (
+    'Li-ion LFP', 'Li-ion NMC', 'Lead-Acid', 'Vanadium Redox Flow',
+    'Sodium-ion', 'Solid State', 'Metal-Air (Iron-Air)', 'Zinc-Hybrid'
+)
+CATEGORIES = ('Commercial', 'Developing')
+BASE_YEAR = 2025
+TIMEFRAMES = (0, 3, 5, 10) # Years from now
+YEARS = tuple(BASE_YEAR + t for t in TIMEFRAMES)
+
+# LCOS assumptions
+DOD = 0.8 # Depth of discharge
+DISCOUNT_RATE = 0.07
+MAX_YEARS = 20 # Calendar life cap
+DAILY_CYCLES = 1
+
+CALENDAR_CYCLES = MAX_YEARS * 365 * DAILY_CYCLES
+
+# O&M annuity factor for every whole realizable cycle count (1 cycle per day),
+# precomputed once since the discount rate is fixed
+ANNUITY_FACTOR = (1 - (1 + DISCOUNT_RATE) ** (-np.arange(CALENDAR_CYCLES + 1) / 365)) / DISCOUNT_RATE
+
 def get_bess_data():
     """
     Returns a DataFrame containing performance and financial data for various BESS technologies
@@ -10,145 +32,94 @@ def get_bess_data():
     """
     
     # Define technologies and their categories
-    technologies = {
-        'Li-ion LFP': {'Type': 'Commercial', 'Maturity': 'Mature'},
-        'Li-ion NMC': {'Type': 'Commercial', 'Maturity': 'Mature'},
-        'Lead-Acid': {'Type': 'Commercial', 'Maturity': 'Legacy'},
-        'Vanadium Redox Flow': {'Type': 'Commercial', 'Maturity': 'Early Commercial'},
-        'Sodium-ion': {'Type': 'Developing', 'Maturity': 'Early Commercial'},
-        'Solid State': {'Type': 'Developing', 'Maturity': 'R&D/Pilot'},
-        'Metal-Air (Iron-Air)': {'Type': 'Developing', 'Maturity': 'Pilot'},
-        'Zinc-Hybrid': {'Type': 'Developing', 'Maturity': 'Pilot'}
-    }
-    
-    timeframes = [0, 3, 5, 10] # Years from now
-    
-    data = []
-    
-    for tech, info in technologies.items():
-        for year in timeframes:
-            # Base values (approximate current status)
-            capex = 0 # $/kWh
-            efficiency = 0 # %
-            cycles = 0 # cycles
-            energy_density = 0 # Wh/L
-            opex_percent = 0 # % of CAPEX/year
-            
-            # Logic to generate representative trends
-            # Note: These are rough estimates for demonstration purposes
-            
-            if tech == 'Li-ion LFP':
-                base_capex = 130
-                capex = base_capex * (0.95 ** year) # 5% year on year decline
-                efficiency = 95 + (0.1 * year)
-                cycles = 6000 + (200 * year)
-                energy_density = 350 + (10 * year)
-                opex_percent = 1.5
-                
-            elif tech == 'Li-ion NMC':
-                base_capex = 145
-                capex = base_capex * (0.96 ** year)
-                efficiency = 96 + (0.05 * year)
-                cycles = 4000 + (100 * year)
-                energy_density = 450 + (15 * year)
-                opex_percent = 2.0
-                
-            elif tech == 'Lead-Acid':
-                base_capex = 100
-                capex = base_capex * (0.99 ** year) # Very mature, slow decline
-                efficiency = 85 + (0.1 * year)
-                cycles = 1500 + (10 * year)
-                energy_density = 80
-                opex_percent = 3.0
-
-            elif tech == 'Vanadium Redox Flow':
-                base_capex = 250 # High initial capex, but long life
-                capex = base_capex * (0.90 ** year) # Fast learning curve expected
-                efficiency = 75 + (0.5 * year) # Improvements expected
-                cycles = 20000 # Almost infinite cycle life
-                energy_density = 40 + (2 * year)
-                opex_percent = 1.0
-                
-            elif tech == 'Sodium-ion':
-                base_capex = 110 # Promising low cost
-                if year == 0: base_capex = 150 # Higher now due to scale
-                capex = base_capex * (0.92 ** year)
-                efficiency = 92 + (0.2 * year)
-                cycles = 4000 + (300 * year)
-                energy_density = 250 + (15 * year)
-                opex_percent = 1.5
-                
-            elif tech == 'Solid State':
-                base_capex = 500 # Very high now
-                if year == 0: 
-                    capex = 800
-                elif year >= 3:
-                    capex = 400 * (0.85 ** (year-3))
-                    
-                efficiency = 98
-                cycles = 5000 + (500 * year)
-                energy_density = 800 + (20 * year)
-                opex_percent = 1.0
-                
-            elif tech == 'Metal-Air (Iron-Air)':
-                base_capex = 200
-                if year >= 3:
-                     capex = 70 * (0.95 ** (year-3)) # Target $20/kWh long term
-                else: 
-                     capex = 200
-                     
-                efficiency = 60 # Low efficiency is characteristic
-                cycles = 5000 
-                energy_density = 100
-                opex_percent = 0.5
-            
-            elif tech == 'Zinc-Hybrid':
-                 base_capex = 180
-                 capex = 180 * (0.94 ** year)
-                 efficiency = 80 + (0.2 * year)
-                 cycles = 10000
-                 energy_density = 150
-                 opex_percent = 1.2
-
-            # Normalize constraints
-            efficiency = min(efficiency, 99.9)
-            
-            data.append({
-                'Technology': tech,
-                'Category': info['Type'],
-                'Maturity': info['Maturity'],
-                'Timeframe (Years)': year,
-                'Year': 2025 + year,
-                'CAPEX ($/kWh)': round(capex, 2),
-                'Efficiency (%)': round(efficiency, 2),
-                'Cycle Life': int(cycles),
-                'Energy Density (Wh/L)': int(energy_density),
-                'OPEX (% of CAPEX)': opex_percent,
-                'LCOS ($/MWh)': calculate_simplified_lcos(capex, opex_percent, cycles, efficiency) 
-            })
-            
-    return pd.DataFrame(data)
+    technologies = np.array(TECHNOLOGIES)
+    categories = np.array([
+        'Commercial', 'Commercial', 'Commercial', 'Commercial',
+        'Developing', 'Developing', 'Developing', 'Developing'
+    ])
+    maturities = np.array([
+        'Mature', 'Mature', 'Legacy', 'Early Commercial',
+        'Early Commercial', 'R&D/Pilot', 'Pilot', 'Pilot'
+    ])
+    
+    years = np.array(TIMEFRAMES)
+    
+    # Per-technology parameters, one entry per technology in the order above
+    # Note: These are rough estimates for demonstration purposes
+    base_capex = np.array([130, 145, 100, 250, 110, 500, 200, 180], dtype=float) # $/kWh
+    capex_decay = np.array([0.95, 0.96, 0.99, 0.90, 0.92, 1.0, 1.0, 0.94]) # Year on year decline
+    base_efficiency = np.array([95, 96, 85, 75, 92, 98, 60, 80], dtype=float) # %
+    efficiency_gain = np.array([0.1, 0.05, 0.1, 0.5, 0.2, 0, 0, 0.2]) # % per year
+    base_cycles = np.array([6000, 4000, 1500, 20000, 4000, 5000, 5000, 10000]) # cycles
+    cycles_gain = np.array([200, 100, 10, 0, 300, 500, 0, 0]) # cycles per year
+    base_density = np.array([350, 450, 80, 40, 250, 800, 100, 150]) # Wh/L
+    density_gain = np.array([10, 15, 0, 2, 15, 20, 0, 0]) # Wh/L per year
+    opex_percent = np.array([1.5, 2.0, 3.0, 1.0, 1.5, 1.0, 0.5, 1.2]) # % of CAPEX/year
+    
+    # Logic to generate representative trends, broadcast as (technology, year)
+    capex = base_capex[:, None] * np.power(capex_decay[:, None], years[None, :])
+    
+    # Sodium-ion: higher now due to scale, promising low cost afterwards
+    sodium = technologies == 'Sodium-ion'
+    capex[sodium] = np.where(years == 0, 150.0, capex[sodium])
+    
+    # Solid State: very high now, steep learning curve from year 3
+    solid_state = technologies == 'Solid State'
+    capex[solid_state] = np.select(
+        [years == 0, years >= 3],
+        [800.0, 400 * np.power(0.85, years - 3)],
+        default=base_capex[solid_state]
+    )
+    
+    # Iron-Air: target $20/kWh long term
+    iron_air = technologies == 'Metal-Air (Iron-Air)'
+    capex[iron_air] = np.where(years >= 3, 70 * np.power(0.95, years - 3), 200.0)
+    
+    efficiency = base_efficiency[:, None] + efficiency_gain[:, None] * years[None, :]
+    cycles = base_cycles[:, None] + cycles_gain[:, None] * years[None, :]
+    energy_density = base_density[:, None] + density_gain[:, None] * years[None, :]
+    opex = np.broadcast_to(opex_percent[:, None], capex.shape)
+    
+    # Normalize constraints
+    efficiency = np.minimum(efficiency, 99.9)
+    
+    n_years = len(years)
+    n_techs = len(technologies)
+    lcos = calculate_simplified_lcos(capex, opex, cycles, efficiency)
+    
+    # Build each column directly in its final dtype so pandas skips inference:
+    # categorical labels in definition order, compact numerics since the
+    # dashboard never needs double precision
+    return pd.DataFrame({
+        'Technology': pd.Categorical(np.repeat(technologies, n_years), categories=technologies),
+        'Category': pd.Categorical(np.repeat(categories, n_years), categories=CATEGORIES),
+        'Maturity': pd.Categorical(np.repeat(maturities, n_years), categories=pd.unique(maturities)),
+        'Timeframe (Years)': np.tile(years, n_techs).astype(np.int8),
+        'Year': (BASE_YEAR + np.tile(years, n_techs)).astype(np.int16),
+        'CAPEX ($/kWh)': np.round(capex, 2).ravel().astype(np.float32),
+        'Efficiency (%)': np.round(efficiency, 2).ravel().astype(np.float32),
+        'Cycle Life': cycles.ravel().astype(np.int32),
+        'Energy Density (Wh/L)': energy_density.ravel().astype(np.int32),
+        'OPEX (% of CAPEX)': opex.ravel().astype(np.float32),
+        'LCOS ($/MWh)': lcos.ravel().astype(np.float32)
+    })
 
 def calculate_simplified_lcos(capex, opex_percent, cycles, efficiency):
     """
     Very simplified LCOS model for relative comparison.
     LCOS ~= (CAPEX + NPV(OPEX)) / Total Discharged Energy
+    
+    Accepts scalars or NumPy arrays of matching shape; scalars return a float.
     """
-    # Assumptions
-    dod = 0.8 # Depth of discharge
-    discount_rate = 0.07
+    capex = np.asarray(capex, dtype=float)
     
     # Total Energy Throughput (kWh) per kWh of capacity over life
     # Capped at calendar life of ~20 years if cycles are huge
-    # Assuming 1 cycle per day
-    max_years = 20
-    daily_cycles = 1
-    total_physical_cycles = cycles
-    total_calendar_cycles = max_years * 365 * daily_cycles
+    total_physical_cycles = np.asarray(cycles, dtype=float)
     
-    realizable_cycles = min(total_physical_cycles, total_calendar_cycles)
+    realizable_cycles = np.minimum(total_physical_cycles, CALENDAR_CYCLES)
     
-    total_energy_discharged = realizable_cycles * dod * (efficiency / 100.0)
+    total_energy_discharged = realizable_cycles * DOD * (np.asarray(efficiency) / 100.0)
     
     # Costs
     # Initial Investment
@@ -156,22 +127,25 @@ def calculate_simplified_lcos(capex, opex_percent, cycles, efficiency):
     
     # O&M NPV
     # Simple annuity approximation for O&M
-    annual_opex = capex * (opex_percent / 100.0)
+    annual_opex = capex * (np.asarray(opex_percent) / 100.0)
     
-    # NPV of O&M over the operational life (years)
-    operational_years = realizable_cycles / 365
-    if discount_rate > 0:
-        opex_npv = annual_opex * ((1 - (1 + discount_rate)**(-operational_years)) / discount_rate)
+    # NPV of O&M over the operational life, looked up by cycle count when
+    # every count is a whole number inside the table
+    cycle_index = realizable_cycles.astype(int)
+    if np.array_equal(cycle_index, realizable_cycles) and np.all(cycle_index >= 0):
+        annuity = ANNUITY_FACTOR[cycle_index]
     else:
-        opex_npv = annual_opex * operational_years
+        operational_years = realizable_cycles / 365
+        annuity = (1 - (1 + DISCOUNT_RATE)**(-operational_years)) / DISCOUNT_RATE
+    opex_npv = annual_opex * annuity
         
     total_cost = investment + opex_npv
     
     # LCOS $/kWh -> $/MWh
-    if total_energy_discharged > 0:
+    with np.errstate(divide='ignore', invalid='ignore'):
         lcos_kwh = total_cost / total_energy_discharged
-        return round(lcos_kwh * 1000, 2)
-    return 0
+    lcos = np.where(total_energy_discharged > 0, np.round(lcos_kwh * 1000, 2), 0)
+    return lcos.item() if lcos.ndim == 0 else lcos
 
 if __name__ == "__main__":
     df = get_bess_data()